@@ -15,6 +15,8 @@ from google_calendar_mcp.utils import (
     format_calendar_error,
     format_calendar_summary,
     format_event_summary,
+    summarize_calendar,
+    summarize_event,
 )
 
 __all__ = [
@@ -25,4 +27,6 @@ __all__ = [
     "format_calendar_error",
     "format_calendar_summary",
     "format_event_summary",
+    "summarize_calendar",
+    "summarize_event",
 ]
@@ -5,50 +5,150 @@ Provides functions to extract credentials from HTTP headers and create
 authenticated Google Calendar service instances.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional, Union
 
+import orjson
 from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import HttpRequest, build_http
 from mcp.server.fastmcp import Context
 
-from google_calendar_mcp.config import SCOPES
+from google_calendar_mcp.config import (
+    BEARER_PREFIX,
+    SCOPES,
+    TOKEN_PREFIXES,
+    get_google_calendar_credentials,
+)
 
 logger = logging.getLogger(__name__)
 
+_CALENDAR_DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/calendar/v3/rest"
 
-def _extract_headers_from_context(ctx: Optional[Context]) -> dict:
-    """Extract HTTP headers from request context as lowercase dict."""
+
+def _load_calendar_discovery_doc() -> str:
+    """Return the Calendar v3 discovery document, fetching it only if googleapiclient does not bundle it."""
+    doc = get_static_doc('calendar', 'v3')
+    if doc is None:
+        import requests
+        
+        logger.warning("Bundled Calendar discovery document not found; fetching %s", _CALENDAR_DISCOVERY_URL)
+        response = requests.get(_CALENDAR_DISCOVERY_URL, timeout=30)
+        response.raise_for_status()
+        doc = response.text
+    return doc
+
+
+# Calendar v3 discovery document, loaded once at import so building a service
+# never reads the discovery file or fetches it over HTTP.
+_CALENDAR_DISCOVERY_DOC = _load_calendar_discovery_doc()
+
+_SERVICE_ACCOUNT_TYPE = 'service_account'
+
+_INVALID_CREDENTIALS_MESSAGE = (
+    "Invalid credentials format. Must be:\n"
+    "1. Simple access token string: 'ya29.a0AfH6SMB...'\n"
+    "2. JSON with access_token: {\"access_token\":\"...\"}\n"
+    "3. Full OAuth JSON: {\"access_token\":\"...\",\"refresh_token\":\"...\",\"client_id\":\"...\",\"client_secret\":\"...\"}\n"
+    "4. Service Account JSON: {\"type\":\"service_account\",...}"
+)
+
+# Shared transport for token refreshes so they reuse pooled keep-alive
+# connections to the OAuth token endpoint instead of a new session each time.
+# Built on first use: requests is only needed once a token has to be refreshed.
+_refresh_request = None
+_refresh_request_lock = threading.Lock()
+
+
+def _get_refresh_request():
+    """Return the shared google-auth transport used for token refreshes."""
+    global _refresh_request
+    if _refresh_request is None:
+        with _refresh_request_lock:
+            if _refresh_request is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from google.auth.transport.requests import Request
+                
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50))
+                _refresh_request = Request(session=session)
+    return _refresh_request
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """Authenticated service cached under a credential fingerprint (never the raw credentials)."""
+    creds: Any
+    service: Any
+    last_used: float
+    # Whether creds can renew themselves; access-token-only entries skip every expiry check
+    refreshable: bool
+    refresh_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+# Authenticated services keyed by credential fingerprint, ordered from least to most
+# recently used. Entries unused for 50 minutes are dropped; refreshable tokens of
+# active entries are renewed in the background shortly before they expire.
+# Tool threads and the refresh loop share the cache, so every access holds
+# _SERVICE_CACHE_LOCK; _BUILD_LOCKS lets one thread build a missing service while
+# other callers for the same credentials wait for it.
+_SERVICE_CACHE: "OrderedDict[bytes, _CacheEntry]" = OrderedDict()
+_SERVICE_CACHE_LOCK = threading.Lock()
+_BUILD_LOCKS: Dict[bytes, threading.Lock] = {}
+_SERVICE_CACHE_TTL_SECONDS = 50 * 60
+_SERVICE_CACHE_MAX_ENTRIES = 256
+_REFRESH_INTERVAL_SECONDS = 60
+_REFRESH_AHEAD_SECONDS = 5 * 60
+
+# Parsed service account credentials keyed by a hash of their key material,
+# see _service_account_credentials. Shared by tool threads, so accessed under its lock.
+_SERVICE_ACCOUNT_CREDS: "OrderedDict[bytes, Any]" = OrderedDict()
+_SERVICE_ACCOUNT_CREDS_LOCK = threading.Lock()
+_SERVICE_ACCOUNT_CREDS_MAX_ENTRIES = 64
+
+# Per-thread httplib2.Http used for API requests, see _thread_http
+_THREAD_HTTP = threading.local()
+
+
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
     if not ctx:
         logger.warning("Context is None - no headers available")
         return {}
     
-    # Check if headers are stored directly in context (for custom routes)
+    # Check if headers are stored directly in context (custom routes store them lowercased)
     if hasattr(ctx, "headers") and ctx.headers:
-        logger.info(f"Found headers in ctx.headers: {list(ctx.headers.keys())}")
-        return {k.lower(): v for k, v in ctx.headers.items()}
+        logger.info("Found headers in ctx.headers: %s", list(ctx.headers.keys()))
+        return ctx.headers
     
     # Try to extract from request context (for MCP tool calls)
     try:
         request_context = ctx.request_context
         if hasattr(request_context, "request") and request_context.request:
-            request = request_context.request
-            headers_dict = {name.lower(): request.headers[name] for name in request.headers.keys()}
-            logger.info(f"Extracted headers from request: {list(headers_dict.keys())}")
-            return headers_dict
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            headers = request_context.request.headers
+            logger.info("Extracted headers from request: %s", list(headers.keys()))
+            return headers
     except Exception as e:
-        logger.warning(f"Could not extract headers from request context: {e}")
+        logger.warning("Could not extract headers from request context: %s", e)
     
     logger.warning("No headers found in context")
     return {}
 
 
-def get_credentials_from_header(ctx: Optional[Context] = None) -> str:
+def get_credentials_from_header(ctx: Optional[Context] = None) -> Union[str, Dict[str, Any]]:
     """
     Extract Google Calendar credentials from HTTP headers.
     
@@ -61,7 +161,7 @@ def get_credentials_from_header(ctx: Optional[Context] = None) -> str:
         ctx: MCP Context object
         
     Returns:
-        JSON string containing credentials
+        Credentials dict, or the raw header value if its format is not recognized
         
     Raises:
         ValueError: If credentials are not found in headers
@@ -89,30 +189,291 @@ def get_credentials_from_header(ctx: Optional[Context] = None) -> str:
             )
         
         # Handle Bearer token format
-        if creds_header.startswith('Bearer '):
-            token = creds_header.replace('Bearer ', '').strip()
-            return json.dumps({"access_token": token})
+        if creds_header.startswith(BEARER_PREFIX):
+            token = creds_header[len(BEARER_PREFIX):].strip()
+            return {"access_token": token}
         
-        # Check if it's already a JSON string
-        try:
-            json.loads(creds_header)
-            return creds_header
-        except json.JSONDecodeError:
-            # If not JSON, treat as plain token and convert to JSON
-            token = creds_header.strip()
-            if token.startswith(('ya29.', '1//', 'ya.a0')):
-                return json.dumps({"access_token": token})
-            return creds_header
+        # JSON credentials always start with '{', so only those are parsed;
+        # malformed JSON is passed on for get_calendar_service to reject
+        stripped = creds_header.strip()
+        if stripped[:1] == '{':
+            try:
+                return orjson.loads(stripped)
+            except orjson.JSONDecodeError:
+                return creds_header
+        
+        # If not JSON, treat as plain access token
+        if stripped.startswith(TOKEN_PREFIXES):
+            return {"access_token": stripped}
+        return creds_header
             
     except ValueError:
         raise
     except Exception as e:
-        logger.error(f"Error extracting credentials from headers: {e}")
+        logger.error("Error extracting credentials from headers: %s", e)
         raise ValueError(f"Failed to extract credentials from headers: {str(e)}")
 
 
+def get_request_credentials(
+    ctx: Optional[Context],
+    headers: Mapping[str, str]
+) -> Union[str, Dict[str, Any]]:
+    """
+    Resolve credentials for a tool call, at most once per HTTP request.
+    
+    The result of get_google_calendar_credentials is memoized on the Starlette
+    request's state, so further tool calls served by the same request (e.g. the
+    per-calendar calls of get_events_multi) reuse it instead of re-reading headers.
+    
+    Args:
+        ctx: MCP Context object, or None
+        headers: HTTP headers extracted from ctx
+        
+    Returns:
+        Credentials as returned by get_google_calendar_credentials
+    """
+    state = None
+    try:
+        request = getattr(ctx.request_context, "request", None) if ctx else None
+        state = getattr(request, "state", None)
+    except Exception:
+        # Custom routes and calls outside a request have no Starlette request
+        pass
+    
+    if state is not None:
+        cached = getattr(state, "_gcal_creds_cache", None)
+        if cached is not None:
+            return cached
+    
+    credentials = get_google_calendar_credentials(headers)
+    if state is not None:
+        state._gcal_creds_cache = credentials
+    return credentials
+
+
+def _thread_http():
+    """
+    Return the calling thread's pooled httplib2.Http.
+    
+    httplib2.Http keeps its HTTPS connections open between requests but is not
+    thread-safe, so each worker thread gets its own instance and later API calls
+    from that thread skip the TCP/TLS handshake.
+    """
+    http = getattr(_THREAD_HTTP, "http", None)
+    if http is None:
+        http = _THREAD_HTTP.http = build_http()
+    return http
+
+
+def _build_request(http, *args, **kwargs) -> HttpRequest:
+    """
+    Build an API request on the calling thread's pooled connection.
+    
+    Tools run in worker threads while sharing cached services, so requests do not
+    use the service's own transport; they are authorized with the service's
+    credentials over the transport of the thread that builds (and executes) them.
+    """
+    return HttpRequest(AuthorizedHttp(http.credentials, http=_thread_http()), *args, **kwargs)
+
+
+def _build_service(creds):
+    """Build a Calendar v3 service whose requests are safe to run concurrently."""
+    return build_from_document(_CALENDAR_DISCOVERY_DOC, credentials=creds, requestBuilder=_build_request)
+
+
+def _credentials_fingerprint(
+    google_calendar_credentials: Union[str, Dict[str, Any]],
+    impersonate_user: Optional[str]
+) -> bytes:
+    """Return a cache key for credentials (string or parsed dict) and impersonated user."""
+    if isinstance(google_calendar_credentials, dict):
+        raw = orjson.dumps(google_calendar_credentials, option=orjson.OPT_SORT_KEYS)
+    else:
+        raw = google_calendar_credentials.encode()
+    # A 128-bit BLAKE2b digest is cheaper than SHA-256 hex and plenty to tell credentials apart
+    return hashlib.blake2b(raw + b"|" + (impersonate_user or "").encode(), digest_size=16).digest()
+
+
+def _seconds_until_expiry(creds) -> Optional[float]:
+    """Return seconds until creds expire, or None if the expiry is unknown."""
+    expiry = creds.expiry
+    if expiry is None:
+        return None
+    now = datetime.now(timezone.utc)
+    if expiry.tzinfo is None:
+        # google-auth stores expiry as a naive UTC datetime
+        now = now.replace(tzinfo=None)
+    return (expiry - now).total_seconds()
+
+
+def _can_refresh(creds) -> bool:
+    """Return True if creds can obtain a new access token on their own."""
+    return isinstance(creds, service_account.Credentials) or bool(getattr(creds, 'refresh_token', None))
+
+
+def _refresh_cached_credentials(entry: _CacheEntry) -> None:
+    """
+    Refresh the credentials of a cache entry in place.
+    
+    The entry's lock makes concurrent callers wait for a refresh already in
+    flight instead of refreshing the same token twice.
+    """
+    creds = entry.creds
+    with entry.refresh_lock:
+        remaining = _seconds_until_expiry(creds)
+        if remaining is not None and remaining > _REFRESH_AHEAD_SECONDS:
+            # Another caller refreshed the token while we waited for the lock
+            return
+        creds.refresh(_get_refresh_request())
+        logger.info("Cached token refreshed. New expiry: %s", creds.expiry)
+
+
+def _get_cached_service(cache_key: bytes):
+    """Return the cached service for cache_key, or None if missing or stale."""
+    now = time.time()
+    with _SERVICE_CACHE_LOCK:
+        entry = _SERVICE_CACHE.get(cache_key)
+        if entry is None:
+            return None
+        if now - entry.last_used >= _SERVICE_CACHE_TTL_SECONDS:
+            del _SERVICE_CACHE[cache_key]
+            return None
+    
+    # Refresh outside the cache lock so a slow token round-trip does not block other credentials
+    if entry.refreshable and entry.creds.expired:
+        try:
+            _refresh_cached_credentials(entry)
+        except Exception as e:
+            logger.warning("Failed to refresh cached token: %s", e)
+            with _SERVICE_CACHE_LOCK:
+                if _SERVICE_CACHE.get(cache_key) is entry:
+                    del _SERVICE_CACHE[cache_key]
+            return None
+    
+    with _SERVICE_CACHE_LOCK:
+        entry.last_used = now
+        if _SERVICE_CACHE.get(cache_key) is entry:
+            _SERVICE_CACHE.move_to_end(cache_key)
+    return entry.service
+
+
+def _cache_service(cache_key: bytes, creds, service):
+    """Store an authenticated service in the cache and return it."""
+    entry = _CacheEntry(creds, service, time.time(), _can_refresh(creds))
+    with _SERVICE_CACHE_LOCK:
+        _SERVICE_CACHE[cache_key] = entry
+        _SERVICE_CACHE.move_to_end(cache_key)
+        if len(_SERVICE_CACHE) > _SERVICE_CACHE_MAX_ENTRIES:
+            # Evict the least recently used entry
+            _SERVICE_CACHE.popitem(last=False)
+    return service
+
+
+def _build_lock(cache_key: bytes) -> threading.Lock:
+    """Return the lock serializing service builds for cache_key."""
+    with _SERVICE_CACHE_LOCK:
+        lock = _BUILD_LOCKS.get(cache_key)
+        if lock is None:
+            lock = _BUILD_LOCKS[cache_key] = threading.Lock()
+        return lock
+
+
+async def refresh_cached_credentials_loop() -> None:
+    """
+    Keep cached tokens fresh in the background.
+    
+    Every minute, refreshes cached credentials that expire within the next
+    5 minutes and drops entries that have not been used for 50 minutes, so
+    tool calls do not pay for a token refresh round-trip.
+    
+    The shared refresh transport is built up front, off the event loop, so the
+    first refresh does not pay for importing requests and creating its session.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, _get_refresh_request)
+    except Exception as e:
+        # Not fatal: the transport is built on the first refresh instead
+        logger.warning("Could not prewarm token refresh transport: %s", e)
+    while True:
+        await asyncio.sleep(_REFRESH_INTERVAL_SECONDS)
+        now = time.time()
+        with _SERVICE_CACHE_LOCK:
+            for cache_key, entry in list(_SERVICE_CACHE.items()):
+                if now - entry.last_used >= _SERVICE_CACHE_TTL_SECONDS:
+                    del _SERVICE_CACHE[cache_key]
+            entries = [entry for entry in _SERVICE_CACHE.values() if entry.refreshable]
+        
+        for entry in entries:
+            remaining = _seconds_until_expiry(entry.creds)
+            if remaining is None or remaining > _REFRESH_AHEAD_SECONDS:
+                continue
+            try:
+                await loop.run_in_executor(None, _refresh_cached_credentials, entry)
+            except Exception as e:
+                logger.warning("Background token refresh failed: %s", e)
+
+
+def _service_account_credentials(creds_data: Dict[str, Any]):
+    """
+    Return service account credentials for creds_data, loading its private key once.
+    
+    Parsing the PEM key is the slow part of from_service_account_info, so the
+    resulting (not impersonated) credentials are cached by a hash of the key
+    and client email. with_subject() derives impersonated credentials from the
+    cached ones without parsing the key again.
+    """
+    raw = (creds_data.get('private_key') or '') + "|" + (creds_data.get('client_email') or '')
+    key = hashlib.sha256(raw.encode()).digest()
+    with _SERVICE_ACCOUNT_CREDS_LOCK:
+        creds = _SERVICE_ACCOUNT_CREDS.get(key)
+    if creds is not None:
+        return creds
+    
+    # Parse the key outside the lock so other service accounts are not held up
+    creds = service_account.Credentials.from_service_account_info(creds_data, scopes=SCOPES)
+    with _SERVICE_ACCOUNT_CREDS_LOCK:
+        _SERVICE_ACCOUNT_CREDS[key] = creds
+        if len(_SERVICE_ACCOUNT_CREDS) > _SERVICE_ACCOUNT_CREDS_MAX_ENTRIES:
+            # Evict the oldest entry
+            _SERVICE_ACCOUNT_CREDS.popitem(last=False)
+    return creds
+
+
+def _parse_credentials(google_calendar_credentials: str) -> Dict[str, Any]:
+    """Parse a credentials string (JSON or a bare access token) into a dict."""
+    # JSON credentials always start with '{'; checking that first keeps plain tokens
+    # off the exception path of a failed JSON parse
+    stripped = google_calendar_credentials.lstrip()
+    if stripped[:1] == '{':
+        try:
+            return orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            raise ValueError(_INVALID_CREDENTIALS_MESSAGE)
+    
+    # Otherwise treat as simple access token string
+    token = stripped.rstrip()
+    if not token.startswith(TOKEN_PREFIXES):
+        raise ValueError(_INVALID_CREDENTIALS_MESSAGE)
+    return {"access_token": token}
+
+
+def is_service_account_credentials(google_calendar_credentials: Union[str, Dict[str, Any]]) -> bool:
+    """
+    Return True if credentials are a service account, the only kind that can impersonate users.
+    
+    Raises:
+        ValueError: If a credentials string is not in a supported format
+    """
+    if isinstance(google_calendar_credentials, dict):
+        creds_data = google_calendar_credentials
+    else:
+        creds_data = _parse_credentials(google_calendar_credentials)
+    return creds_data.get('type') == _SERVICE_ACCOUNT_TYPE
+
+
 def get_calendar_service(
-    google_calendar_credentials: str,
+    google_calendar_credentials: Union[str, Dict[str, Any]],
     impersonate_user: Optional[str] = None
 ):
     """
@@ -136,7 +497,8 @@ def get_calendar_service(
     - Without client_id and client_secret, you'll need to manually provide a new access token every hour
     
     Args:
-        google_calendar_credentials: Credentials in one of the supported formats
+        google_calendar_credentials: Credentials in one of the supported formats, either as a
+            string or as an already-parsed dict (as returned by get_google_calendar_credentials)
         impersonate_user: Optional email for service account domain-wide delegation
         
     Returns:
@@ -145,115 +507,119 @@ def get_calendar_service(
     Raises:
         ValueError: If credentials format is invalid or authentication fails
     """
-    creds_data = None
+    # Reuse the service built for identical credentials while its token is still valid
+    cache_key = _credentials_fingerprint(google_calendar_credentials, impersonate_user)
+    service = _get_cached_service(cache_key)
+    if service is not None:
+        return service
     
-    # Try to parse as JSON first
+    # Concurrent callers with the same credentials (e.g. a get_events_multi fan-out)
+    # wait for a single build instead of each building their own service
+    lock = _build_lock(cache_key)
     try:
-        creds_data = json.loads(google_calendar_credentials)
-    except json.JSONDecodeError:
-        # If not JSON, treat as simple access token string
-        if google_calendar_credentials.strip().startswith(('ya29.', '1//', 'ya.a0')):
-            creds_data = {"access_token": google_calendar_credentials.strip()}
-        else:
-            raise ValueError(
-                "Invalid credentials format. Must be:\n"
-                "1. Simple access token string: 'ya29.a0AfH6SMB...'\n"
-                "2. JSON with access_token: {\"access_token\":\"...\"}\n"
-                "3. Full OAuth JSON: {\"access_token\":\"...\",\"refresh_token\":\"...\",\"client_id\":\"...\",\"client_secret\":\"...\"}\n"
-                "4. Service Account JSON: {\"type\":\"service_account\",...}"
-            )
+        with lock:
+            service = _get_cached_service(cache_key)
+            if service is None:
+                service = _create_service(google_calendar_credentials, impersonate_user, cache_key)
+    finally:
+        # Drop the lock even when the build fails, so rejected credentials do not pile up
+        with _SERVICE_CACHE_LOCK:
+            if _BUILD_LOCKS.get(cache_key) is lock:
+                del _BUILD_LOCKS[cache_key]
+    return service
+
+
+def _create_service(
+    google_calendar_credentials: Union[str, Dict[str, Any]],
+    impersonate_user: Optional[str],
+    cache_key: bytes
+):
+    """Authenticate credentials, then build and cache a service for them."""
+    if isinstance(google_calendar_credentials, dict):
+        # Already parsed by the header resolver, so there is no JSON round-trip
+        creds_data = google_calendar_credentials
+    else:
+        creds_data = _parse_credentials(google_calendar_credentials)
     
     # Method 1: Service Account
-    if creds_data.get('type') == 'service_account':
+    if creds_data.get('type') == _SERVICE_ACCOUNT_TYPE:
         try:
-            creds = service_account.Credentials.from_service_account_info(
-                creds_data, scopes=SCOPES
-            )
+            creds = _service_account_credentials(creds_data)
             
             if impersonate_user:
                 creds = creds.with_subject(impersonate_user)
             
-            return build('calendar', 'v3', credentials=creds)
+            return _cache_service(cache_key, creds, _build_service(creds))
         except Exception as e:
             raise ValueError(f"Service Account authentication failed: {e}")
     
     # Method 2: OAuth Token
-    elif 'token' in creds_data or 'access_token' in creds_data:
-        try:
-            token = creds_data.get('token') or creds_data.get('access_token')
-            refresh_token = creds_data.get('refresh_token')
-            token_uri = creds_data.get('token_uri', 'https://oauth2.googleapis.com/token')
-            client_id = creds_data.get('client_id')
-            client_secret = creds_data.get('client_secret')
-            
-            # Try to get client_id and client_secret from environment if not provided
-            if not client_id:
-                client_id = os.getenv("GOOGLE_CLIENT_ID")
-            if not client_secret:
-                client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
-            
-            if not token:
-                raise ValueError("OAuth token must contain 'token' or 'access_token' field")
-            
-            # Check if we have refresh capability
-            has_refresh_token = bool(refresh_token)
-            has_client_credentials = bool(client_id and client_secret)
+    token = creds_data.get('token') or creds_data.get('access_token')
+    if not token:
+        raise ValueError(_INVALID_CREDENTIALS_MESSAGE)
+    
+    try:
+        refresh_token = creds_data.get('refresh_token')
+        token_uri = creds_data.get('token_uri', 'https://oauth2.googleapis.com/token')
+        client_id = creds_data.get('client_id')
+        client_secret = creds_data.get('client_secret')
+        
+        # Try to get client_id and client_secret from environment if not provided
+        if not client_id:
+            client_id = os.getenv("GOOGLE_CLIENT_ID")
+        if not client_secret:
+            client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
+        
+        # Check if we have refresh capability
+        has_refresh_token = bool(refresh_token)
+        has_client_credentials = bool(client_id and client_secret)
+        
+        if has_refresh_token and not has_client_credentials:
+            logger.warning(
+                "Refresh token provided but client_id and client_secret are missing. "
+                "Automatic token refresh will not work. Please provide client_id and client_secret for automatic refresh."
+            )
+            # Still create credentials but without refresh capability
+            creds = Credentials(token=token, scopes=SCOPES)
+        elif has_refresh_token and has_client_credentials:
+            # Full OAuth credentials with automatic refresh capability
+            creds = Credentials(
+                token=token,
+                refresh_token=refresh_token,
+                token_uri=token_uri,
+                client_id=client_id,
+                client_secret=client_secret,
+                scopes=SCOPES
+            )
             
-            if has_refresh_token and not has_client_credentials:
-                logger.warning(
-                    "Refresh token provided but client_id and client_secret are missing. "
-                    "Automatic token refresh will not work. Please provide client_id and client_secret for automatic refresh."
-                )
-                # Still create credentials but without refresh capability
-                creds = Credentials(token=token, scopes=SCOPES)
-            elif has_refresh_token and has_client_credentials:
-                # Full OAuth credentials with automatic refresh capability
-                creds = Credentials(
-                    token=token,
-                    refresh_token=refresh_token,
-                    token_uri=token_uri,
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    scopes=SCOPES
-                )
-                
-                # Automatically refresh if expired
-                # The Credentials object automatically handles expiry checking
-                if creds.expired:
-                    try:
-                        logger.info("Access token expired. Refreshing token automatically...")
-                        creds.refresh(Request())
-                        logger.info("Token refreshed successfully. New expiry: %s", creds.expiry)
-                    except Exception as refresh_error:
-                        logger.error(f"Failed to refresh token: {refresh_error}")
-                        raise ValueError(
-                            f"Failed to refresh expired token: {refresh_error}. "
-                            "Please check your refresh_token, client_id, and client_secret are correct."
-                        )
-                else:
-                    # Token is still valid, but log when it will expire
-                    if creds.expiry:
-                        now = datetime.now(creds.expiry.tzinfo if creds.expiry.tzinfo else timezone.utc)
-                        time_until_expiry = (creds.expiry - now).total_seconds()
-                        if time_until_expiry > 0:
-                            logger.debug(f"Access token valid. Expires in {int(time_until_expiry/60)} minutes")
+            # Automatically refresh if expired
+            # The Credentials object automatically handles expiry checking
+            if creds.expired:
+                try:
+                    logger.info("Access token expired. Refreshing token automatically...")
+                    creds.refresh(_get_refresh_request())
+                    logger.info("Token refreshed successfully. New expiry: %s", creds.expiry)
+                except Exception as refresh_error:
+                    logger.error("Failed to refresh token: %s", refresh_error)
+                    raise ValueError(
+                        f"Failed to refresh expired token: {refresh_error}. "
+                        "Please check your refresh_token, client_id, and client_secret are correct."
+                    )
             else:
-                # Simple access token only - works for ~1 hour
-                logger.warning(
-                    "No refresh token provided. Access token will expire in ~1 hour. "
-                    "To enable automatic refresh, provide refresh_token, client_id, and client_secret."
-                )
-                creds = Credentials(token=token, scopes=SCOPES)
-            
-            return build('calendar', 'v3', credentials=creds)
-        except Exception as e:
-            raise ValueError(f"OAuth token authentication failed: {e}")
-    
-    else:
-        raise ValueError(
-            "Invalid credentials format. Must be:\n"
-            "1. Simple access token string: 'ya29.a0AfH6SMB...'\n"
-            "2. JSON with access_token: {\"access_token\":\"...\"}\n"
-            "3. Full OAuth JSON: {\"access_token\":\"...\",\"refresh_token\":\"...\",\"client_id\":\"...\",\"client_secret\":\"...\"}\n"
-            "4. Service Account JSON: {\"type\":\"service_account\",...}"
-        )
+                # Token is still valid, but log when it will expire
+                if creds.expiry:
+                    now = datetime.now(creds.expiry.tzinfo if creds.expiry.tzinfo else timezone.utc)
+                    time_until_expiry = (creds.expiry - now).total_seconds()
+                    if time_until_expiry > 0:
+                        logger.debug("Access token valid. Expires in %s minutes", int(time_until_expiry / 60))
+        else:
+            # Simple access token only - works for ~1 hour
+            logger.warning(
+                "No refresh token provided. Access token will expire in ~1 hour. "
+                "To enable automatic refresh, provide refresh_token, client_id, and client_secret."
+            )
+            creds = Credentials(token=token, scopes=SCOPES)
+        
+        return _cache_service(cache_key, creds, _build_service(creds))
+    except Exception as e:
+        raise ValueError(f"OAuth token authentication failed: {e}")
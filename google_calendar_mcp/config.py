@@ -4,9 +4,10 @@ Configuration for the Google Calendar MCP Server.
 Provides credential resolution, constants, and configuration settings.
 """
 
-import json
 import os
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional, Union
+
+import orjson
 
 # Google Calendar API scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar']
@@ -16,8 +17,12 @@ DEFAULT_CALENDAR_ID = "primary"
 DEFAULT_MAX_RESULTS = 10
 DEFAULT_REMINDERS_MINUTES = 15
 
+# Prefixes of Google OAuth access/refresh tokens accepted without a JSON wrapper
+TOKEN_PREFIXES = ('ya29.', '1//', 'ya.a0')
+BEARER_PREFIX = 'Bearer '
+
 
-def get_google_calendar_credentials(headers: Optional[dict] = None) -> str:
+def get_google_calendar_credentials(headers: Optional[Mapping[str, str]] = None) -> Union[str, Dict[str, Any]]:
     """
     Extract Google Calendar credentials from headers or environment.
     
@@ -38,10 +43,12 @@ def get_google_calendar_credentials(headers: Optional[dict] = None) -> str:
     2. Environment variables (GOOGLE_CALENDAR_CREDENTIALS) - FALLBACK ONLY
     
     Args:
-        headers: Dictionary of HTTP headers (lowercase keys)
+        headers: HTTP headers, looked up by lowercase name (a dict or Starlette Headers)
         
     Returns:
-        JSON string containing credentials
+        Credentials dict, ready for get_calendar_service. Values that are neither
+        JSON nor a recognizable token are returned unchanged for
+        get_calendar_service to reject.
         
     Raises:
         ValueError: If credentials are not found in headers or environment
@@ -58,7 +65,7 @@ def get_google_calendar_credentials(headers: Optional[dict] = None) -> str:
     client_id = headers.get("x-google-calendar-client-id")
     client_secret = headers.get("x-google-calendar-client-secret")
     
-    # If we have access_token from separate header, build JSON from separate headers
+    # If we have access_token from separate header, build credentials from separate headers
     if access_token:
         creds_dict = {"access_token": access_token.strip()}
         
@@ -69,7 +76,7 @@ def get_google_calendar_credentials(headers: Optional[dict] = None) -> str:
         if client_secret:
             creds_dict["client_secret"] = client_secret.strip()
         
-        return json.dumps(creds_dict)
+        return creds_dict
     
     # Format 2: Check for single JSON header or Authorization header
     # IMPORTANT: Check x-google-calendar-credentials first (could be JSON string)
@@ -90,18 +97,20 @@ def get_google_calendar_credentials(headers: Optional[dict] = None) -> str:
         )
     
     # Handle Bearer token format
-    if creds_value.startswith('Bearer '):
-        token = creds_value.replace('Bearer ', '').strip()
-        return json.dumps({"access_token": token})
+    if creds_value.startswith(BEARER_PREFIX):
+        token = creds_value[len(BEARER_PREFIX):].strip()
+        return {"access_token": token}
+    
+    # JSON credentials always start with '{', so only those are parsed;
+    # malformed JSON is passed on for get_calendar_service to reject
+    if creds_value[:1] == '{':
+        try:
+            return orjson.loads(creds_value)
+        except orjson.JSONDecodeError:
+            return creds_value
     
-    # Check if it's already a JSON string
-    try:
-        json.loads(creds_value)
-        return creds_value
-    except json.JSONDecodeError:
-        # If not JSON, treat as plain token and convert to JSON
-        token = creds_value.strip()
-        if token.startswith(('ya29.', '1//', 'ya.a0')):
-            return json.dumps({"access_token": token})
-        # Return as-is if we can't determine format (get_calendar_service will validate)
-        return creds_value
\ No newline at end of file
+    # If not JSON, treat as plain access token
+    if creds_value.startswith(TOKEN_PREFIXES):
+        return {"access_token": creds_value}
+    # Return as-is if we can't determine format (get_calendar_service will validate)
+    return creds_value
\ No newline at end of file
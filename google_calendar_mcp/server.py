@@ -2,13 +2,17 @@
 Google Calendar MCP Server.
 
 Exposes Google Calendar management tools via FastMCP:
-list_calendars, get_events, create_event, check_availability, delete_event.
+list_calendars, get_events, get_events_multi, create_event, check_availability,
+delete_event, batch_calendar_ops.
 """
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
+import orjson
 from dateutil import parser as date_parser
 from dateutil.tz import gettz
 
@@ -17,7 +21,7 @@ from mcp.server.transport_security import TransportSecuritySettings
 from starlette.requests import Request as StarletteRequest
 from starlette.responses import JSONResponse
 
-from google_calendar_mcp.auth import get_calendar_service
+from google_calendar_mcp.auth import get_calendar_service, refresh_cached_credentials_loop
 from google_calendar_mcp.config import (
     DEFAULT_CALENDAR_ID,
     DEFAULT_MAX_RESULTS,
@@ -32,34 +36,43 @@ from google_calendar_mcp.utils import (
     parse_natural_datetime,
 )
 
-logging.basicConfig(
-    format="[%(levelname)s] %(name)s: %(message)s",
-    level=logging.INFO
-)
+# Leave logging alone if the embedding application already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        format="[%(levelname)s] %(name)s: %(message)s",
+        level=logging.INFO
+    )
 logger = logging.getLogger(__name__)
 
 
-def _extract_headers_from_context(ctx: Optional[Context]) -> Dict[str, str]:
-    """Extract HTTP headers from request context as lowercase dict."""
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
     if not ctx:
         return {}
     
-    # Check if headers are stored directly in context (for custom routes)
+    # Check if headers are stored directly in context (custom routes store them lowercased)
     if hasattr(ctx, "headers") and ctx.headers:
-        return {k.lower(): v for k, v in ctx.headers.items()}
+        return ctx.headers
     
     # Try to extract from request context (for MCP tool calls)
     try:
         request_context = ctx.request_context
         if hasattr(request_context, "request") and request_context.request:
-            request = request_context.request
-            return {name.lower(): request.headers[name] for name in request.headers.keys()}
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
     except Exception as e:
-        logger.debug(f"Could not extract headers from request context: {e}")
+        logger.debug("Could not extract headers from request context: %s", e)
     
     return {}
 
 
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson instead of the stdlib json module."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
 # Create FastMCP server with gateway-specific settings
 mcp = FastMCP(
     "Google Calendar MCP",
@@ -81,7 +94,7 @@ mcp = FastMCP(
 @mcp.custom_route("/google-calendar/mcp", methods=["GET"])
 async def discovery(_request: StarletteRequest) -> JSONResponse:
     """Discovery endpoint for transport detection."""
-    return JSONResponse({
+    return ORJSONResponse({
         "transport": "HTTP_STREAMABLE",
         "protocol": "streamable-http",
         "message": "Google Calendar MCP Server - Set transport to HTTP_STREAMABLE",
@@ -122,16 +135,16 @@ async def create_event_simple(request: StarletteRequest) -> JSONResponse:
         
         # Call create_event tool directly with the arguments
         from google_calendar_mcp.tools.create_event import create_event as create_event_impl
-        result = create_event_impl(ctx=ctx, **body)
+        result = await asyncio.to_thread(create_event_impl, ctx=ctx, **body)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "result": result
         })
         
     except Exception as e:
         logger.exception("Error in simplified endpoint")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "success": False,
                 "error": str(e),
@@ -177,16 +190,16 @@ async def delete_event_simple(request: StarletteRequest) -> JSONResponse:
         
         ctx = SimpleContext(headers_dict)
         from google_calendar_mcp.tools.delete_event import delete_event as delete_event_impl
-        result = delete_event_impl(ctx=ctx, **body)
+        result = await asyncio.to_thread(delete_event_impl, ctx=ctx, **body)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "result": result
         })
         
     except Exception as e:
         logger.exception("Error in delete endpoint")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "success": False,
                 "error": str(e),
@@ -222,16 +235,16 @@ async def check_availability_simple(request: StarletteRequest) -> JSONResponse:
         
         ctx = SimpleContext(headers_dict)
         from google_calendar_mcp.tools.check_availability import check_availability as check_availability_impl
-        result = check_availability_impl(ctx=ctx, **body)
+        result = await asyncio.to_thread(check_availability_impl, ctx=ctx, **body)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "result": result
         })
         
     except Exception as e:
         logger.exception("Error in check_availability endpoint")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "success": False,
                 "error": str(e),
@@ -264,16 +277,16 @@ async def list_calendars_simple(request: StarletteRequest) -> JSONResponse:
         
         ctx = SimpleContext(headers_dict)
         from google_calendar_mcp.tools.list_calendars import list_calendars as list_calendars_impl
-        result = list_calendars_impl(ctx=ctx, **body)
+        result = await asyncio.to_thread(list_calendars_impl, ctx=ctx, **body)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "result": result
         })
         
     except Exception as e:
         logger.exception("Error in list_calendars endpoint")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "success": False,
                 "error": str(e),
@@ -332,16 +345,16 @@ async def get_events_simple(request: StarletteRequest) -> JSONResponse:
             body["time_max"] = end_dt.isoformat()
         
         from google_calendar_mcp.tools.get_events import get_events as get_events_impl
-        result = get_events_impl(ctx=ctx, **body)
+        result = await asyncio.to_thread(get_events_impl, ctx=ctx, **body)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "result": result
         })
         
     except Exception as e:
         logger.exception("Error in get_events endpoint")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "success": False,
                 "error": str(e),
@@ -356,38 +369,70 @@ async def get_events_simple(request: StarletteRequest) -> JSONResponse:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def list_calendars(
+async def list_calendars(
     impersonate_user: Optional[str] = None,
+    structured: bool = False,
     ctx: Context = None
-) -> str:
+) -> Union[str, List[Dict[str, Any]]]:
     """List all available calendars."""
     from google_calendar_mcp.tools.list_calendars import list_calendars as list_calendars_impl
-    return list_calendars_impl(impersonate_user=impersonate_user, ctx=ctx)
+    return await asyncio.to_thread(
+        list_calendars_impl,
+        impersonate_user=impersonate_user,
+        structured=structured,
+        ctx=ctx
+    )
 
 
 @mcp.tool()
-def get_events(
+async def get_events(
     calendar_id: str = DEFAULT_CALENDAR_ID,
     max_results: int = DEFAULT_MAX_RESULTS,
     time_min: Optional[str] = None,
     time_max: Optional[str] = None,
     impersonate_user: Optional[str] = None,
+    structured: bool = False,
     ctx: Context = None
-) -> str:
+) -> Union[str, List[Dict[str, Any]]]:
     """Get calendar events."""
     from google_calendar_mcp.tools.get_events import get_events as get_events_impl
-    return get_events_impl(
+    return await asyncio.to_thread(
+        get_events_impl,
         calendar_id=calendar_id,
         max_results=max_results,
         time_min=time_min,
         time_max=time_max,
         impersonate_user=impersonate_user,
+        structured=structured,
         ctx=ctx
     )
 
 
 @mcp.tool()
-def create_event(
+async def get_events_multi(
+    calendar_ids: str,
+    max_results: int = DEFAULT_MAX_RESULTS,
+    time_min: Optional[str] = None,
+    time_max: Optional[str] = None,
+    impersonate_users: Optional[str] = None,
+    structured: bool = False,
+    ctx: Context = None
+) -> Union[str, List[Dict[str, Any]]]:
+    """Get events from several calendars and/or impersonated accounts concurrently."""
+    from google_calendar_mcp.tools.get_events_multi import get_events_multi as get_events_multi_impl
+    return await get_events_multi_impl(
+        calendar_ids=calendar_ids,
+        max_results=max_results,
+        time_min=time_min,
+        time_max=time_max,
+        impersonate_users=impersonate_users,
+        structured=structured,
+        ctx=ctx
+    )
+
+
+@mcp.tool()
+async def create_event(
     summary: str,
     date: str,
     start_time: str,
@@ -405,7 +450,8 @@ def create_event(
 ) -> str:
     """Create a calendar event with natural language date/time input."""
     from google_calendar_mcp.tools.create_event import create_event as create_event_impl
-    return create_event_impl(
+    return await asyncio.to_thread(
+        create_event_impl,
         summary=summary,
         date=date,
         start_time=start_time,
@@ -424,7 +470,7 @@ def create_event(
 
 
 @mcp.tool()
-def check_availability(
+async def check_availability(
     date: str,
     start_time: str,
     end_time: Optional[str] = None,
@@ -432,11 +478,15 @@ def check_availability(
     calendar_id: str = DEFAULT_CALENDAR_ID,
     timezone: Optional[str] = None,
     impersonate_user: Optional[str] = None,
+    calendar_ids: Optional[str] = None,
+    structured: bool = False,
+    include_titles: bool = False,
     ctx: Context = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """Check calendar availability for a time range using natural language date/time."""
     from google_calendar_mcp.tools.check_availability import check_availability as check_availability_impl
-    return check_availability_impl(
+    return await asyncio.to_thread(
+        check_availability_impl,
         date=date,
         start_time=start_time,
         end_time=end_time,
@@ -444,12 +494,15 @@ def check_availability(
         calendar_id=calendar_id,
         timezone=timezone,
         impersonate_user=impersonate_user,
+        calendar_ids=calendar_ids,
+        structured=structured,
+        include_titles=include_titles,
         ctx=ctx
     )
 
 
 @mcp.tool()
-def delete_event(
+async def delete_event(
     event_id: Optional[str] = None,
     date: Optional[str] = None,
     start_time: Optional[str] = None,
@@ -462,7 +515,8 @@ def delete_event(
 ) -> str:
     """Delete a calendar event by event ID, or by date/time and event name."""
     from google_calendar_mcp.tools.delete_event import delete_event as delete_event_impl
-    return delete_event_impl(
+    return await asyncio.to_thread(
+        delete_event_impl,
         event_id=event_id,
         date=date,
         start_time=start_time,
@@ -474,6 +528,22 @@ def delete_event(
         ctx=ctx
     )
 
+
+@mcp.tool()
+async def batch_calendar_ops(
+    ops_json: Union[str, List[Dict[str, Any]]],
+    impersonate_user: Optional[str] = None,
+    ctx: Context = None
+) -> str:
+    """Run several calendar operations (list_calendars, list_events, get_event, delete_event) in one batched request."""
+    from google_calendar_mcp.tools.batch_calendar_ops import batch_calendar_ops as batch_calendar_ops_impl
+    return await asyncio.to_thread(
+        batch_calendar_ops_impl,
+        ops_json=ops_json,
+        impersonate_user=impersonate_user,
+        ctx=ctx
+    )
+
 # ---------------------------------------------------------------------------
 # Main Entry Point
 # ---------------------------------------------------------------------------
@@ -482,14 +552,27 @@ async def main() -> None:
     """Main entry point for the Google Calendar MCP Server."""
     port = int(os.getenv("PORT", 7860))
     host = os.getenv("HOST", "0.0.0.0")
+    # Tools run their blocking Google API calls on the default executor; its stock
+    # size (min(32, cpu + 4)) would cap how many tool calls are served at once
+    max_workers = int(os.getenv("MAX_WORKERS", 64))
     
     mcp.settings.host = host
     mcp.settings.port = port
     mcp.settings.log_level = "INFO"
     
     logger.info(
-        f"Google Calendar MCP Server starting on http://{host}:{port}\n"
-        "Streamable HTTP and discovery at /google-calendar/mcp"
+        "Google Calendar MCP Server starting on http://%s:%s\n"
+        "Streamable HTTP and discovery at /google-calendar/mcp",
+        host, port
+    )
+    
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="calendar-tool")
     )
     
-    await mcp.run_streamable_http_async()
+    # Renew cached tokens ahead of expiry so tool calls never wait on a refresh
+    refresh_task = asyncio.create_task(refresh_cached_credentials_loop())
+    try:
+        await mcp.run_streamable_http_async()
+    finally:
+        refresh_task.cancel()
@@ -0,0 +1,129 @@
+"""
+Batch calendar operations tool for Google Calendar MCP Server.
+"""
+
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import orjson
+from mcp.server.fastmcp import Context
+
+from google_calendar_mcp.auth import get_calendar_service, get_request_credentials
+from google_calendar_mcp.config import DEFAULT_CALENDAR_ID
+from google_calendar_mcp.utils import format_calendar_error, log_tool_error
+
+logger = logging.getLogger(__name__)
+
+# Google Calendar accepts at most 50 calls in a single batch request
+MAX_BATCH_SIZE = 50
+
+SUPPORTED_OPS = ('list_calendars', 'list_events', 'get_event', 'delete_event')
+
+
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
+    if not ctx:
+        return {}
+    
+    # Check if headers are stored directly in context (custom routes store them lowercased)
+    if hasattr(ctx, "headers") and ctx.headers:
+        return ctx.headers
+    
+    # Try to extract from request context (for MCP tool calls)
+    try:
+        request_context = ctx.request_context
+        if hasattr(request_context, "request") and request_context.request:
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
+    except Exception as e:
+        logger.debug("Could not extract headers from request context: %s", e)
+    
+    return {}
+
+
+def _op_name(op) -> Optional[str]:
+    """Return the op name of a batch operation, if it has one."""
+    return op.get('op') if isinstance(op, dict) else None
+
+
+def _build_operation(service, op: dict):
+    """Build the API request for a single batch operation."""
+    if not isinstance(op, dict):
+        raise ValueError("Each operation must be a JSON object")
+    name = op.get('op')
+    calendar_id = op.get('calendar_id') or DEFAULT_CALENDAR_ID
+    args = op.get('args') or {}
+    
+    if name == 'list_calendars':
+        return service.calendarList().list(**args)
+    if name == 'list_events':
+        return service.events().list(calendarId=calendar_id, **args)
+    if name == 'get_event':
+        return service.events().get(calendarId=calendar_id, **args)
+    if name == 'delete_event':
+        return service.events().delete(calendarId=calendar_id, **args)
+    raise ValueError(f"Unsupported op '{name}'. Supported ops: {', '.join(SUPPORTED_OPS)}")
+
+
+def batch_calendar_ops(
+    ops_json: Union[str, List[Dict[str, Any]]],
+    impersonate_user: Optional[str] = None,
+    ctx: Context = None
+) -> str:
+    """
+    Run several calendar operations in a single batched HTTPS request.
+    
+    Credentials are automatically retrieved from HTTP headers.
+    No need to pass credentials as a parameter.
+    
+    Args:
+        ops_json: JSON array of operations (as a string or an already-decoded list),
+                  each of the form {"op": "...", "calendar_id": "...", "args": {...}}.
+                  Supported ops: list_calendars, list_events, get_event, delete_event.
+                  "args" are passed through as Google Calendar API parameters
+                  (e.g. {"timeMin": "...", "maxResults": 5} or {"eventId": "..."}).
+                  calendar_id defaults to 'primary'.
+        impersonate_user: Optional email for service account domain-wide delegation.
+    
+    Returns:
+        JSON array with one entry per operation, in request order, holding either
+        the API "result" or an "error" message.
+    """
+    try:
+        ops = orjson.loads(ops_json) if isinstance(ops_json, str) else ops_json
+        if not isinstance(ops, list) or not ops:
+            raise ValueError("ops_json must be a non-empty JSON array of operations")
+        
+        headers = _extract_headers_from_context(ctx)
+        credentials = get_request_credentials(ctx, headers)
+        service = get_calendar_service(credentials, impersonate_user)
+        
+        results = [None] * len(ops)
+        
+        def _callback(request_id, response, exception):
+            index = int(request_id)
+            if exception is not None:
+                results[index] = {'op': _op_name(ops[index]), 'error': format_calendar_error(exception)}
+            else:
+                # delete returns an empty body
+                results[index] = {'op': _op_name(ops[index]), 'result': response or {}}
+        
+        # Send the operations in as few batch requests as the API allows
+        for offset in range(0, len(ops), MAX_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_callback)
+            added = 0
+            for index in range(offset, min(offset + MAX_BATCH_SIZE, len(ops))):
+                try:
+                    batch.add(_build_operation(service, ops[index]), request_id=str(index))
+                    added += 1
+                except Exception as e:
+                    results[index] = {'op': _op_name(ops[index]), 'error': str(e)}
+            if added:
+                batch.execute()
+        
+        # Results carry whole API resources, so serialize them with orjson
+        return orjson.dumps(results).decode()
+    
+    except Exception as e:
+        log_tool_error(logger, "Error running batch calendar operations", e)
+        return f"Error running batch calendar operations: {format_calendar_error(e)}"
@@ -4,43 +4,139 @@ Check availability tool for Google Calendar MCP Server.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from dateutil.tz import gettz
 from mcp.server.fastmcp import Context
 
-from google_calendar_mcp.auth import get_calendar_service
-from google_calendar_mcp.config import DEFAULT_CALENDAR_ID, get_google_calendar_credentials
+from google_calendar_mcp.auth import get_calendar_service, get_request_credentials
+from google_calendar_mcp.config import DEFAULT_CALENDAR_ID
 from google_calendar_mcp.utils import (
     format_calendar_error,
     get_timezone_from_location,
+    log_tool_error,
     parse_natural_datetime,
+    split_csv,
+    summarize_event,
 )
 
 logger = logging.getLogger(__name__)
 
+# freebusy.query accepts at most 50 calendars per request
+MAX_FREEBUSY_CALENDARS = 50
 
-def _extract_headers_from_context(ctx: Optional[Context]) -> dict:
-    """Extract HTTP headers from request context as lowercase dict."""
+# Stand-in for a calendar the freebusy response leaves out, so it is reported
+# as unchecked rather than free
+_MISSING_CALENDAR = {'errors': [{'reason': 'notFound'}]}
+
+
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
     if not ctx:
         return {}
     
-    # Check if headers are stored directly in context (for custom routes)
+    # Check if headers are stored directly in context (custom routes store them lowercased)
     if hasattr(ctx, "headers") and ctx.headers:
-        return {k.lower(): v for k, v in ctx.headers.items()}
+        return ctx.headers
     
     # Try to extract from request context (for MCP tool calls)
     try:
         request_context = ctx.request_context
         if hasattr(request_context, "request") and request_context.request:
-            request = request_context.request
-            return {name.lower(): request.headers[name] for name in request.headers.keys()}
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
     except Exception as e:
-        logger.debug(f"Could not extract headers from request context: {e}")
+        logger.debug("Could not extract headers from request context: %s", e)
     
     return {}
 
 
+def _format_busy_time(value: str, target_timezone: str) -> str:
+    """Format an RFC3339 timestamp from the API as readable local time."""
+    try:
+        dt = datetime.fromisoformat(value)
+        tz_obj = gettz(target_timezone)
+        if tz_obj:
+            dt = dt.astimezone(tz_obj) if dt.tzinfo else dt.replace(tzinfo=gettz('UTC')).astimezone(tz_obj)
+        return dt.strftime('%d %b %Y, %I:%M %p')
+    except Exception as e:
+        logger.debug("Error formatting busy time: %s", e)
+        return value
+
+
+def _check_calendars_busy(
+    service,
+    ids: List[str],
+    time_min: str,
+    time_max: str,
+    range_description: str,
+    target_timezone: str,
+    structured: bool = False
+) -> Union[str, Dict[str, Any]]:
+    """
+    Check one or more calendars with a single freebusy query.
+    
+    freebusy only returns busy intervals, so unlike events.list the server does
+    not expand and sort events and no event bodies are transferred.
+    """
+    if not ids:
+        raise ValueError("calendar_ids must contain at least one calendar ID")
+    if len(ids) > MAX_FREEBUSY_CALENDARS:
+        raise ValueError(f"At most {MAX_FREEBUSY_CALENDARS} calendars can be checked at once, got {len(ids)}")
+    
+    freebusy_result = service.freebusy().query(body={
+        'timeMin': time_min,
+        'timeMax': time_max,
+        'items': [{'id': cal_id} for cal_id in ids],
+    }).execute()
+    
+    calendars = freebusy_result.get('calendars', {})
+    
+    if structured:
+        busy = []
+        errors = []
+        for cal_id in ids:
+            calendar = calendars.get(cal_id, _MISSING_CALENDAR)
+            for error in calendar.get('errors', []):
+                errors.append({'calendar_id': cal_id, 'reason': error.get('reason', 'unknown')})
+            for period in calendar.get('busy', []):
+                busy.append({'calendar_id': cal_id, 'start': period['start'], 'end': period['end']})
+        return {
+            'available': not busy and not errors,
+            'time_min': time_min,
+            'time_max': time_max,
+            'timezone': target_timezone,
+            'busy': busy,
+            'errors': errors,
+        }
+    
+    single = len(ids) == 1
+    result = []
+    for cal_id in ids:
+        calendar = calendars.get(cal_id, _MISSING_CALENDAR)
+        errors = calendar.get('errors')
+        if errors:
+            reasons = ", ".join(error.get('reason', 'unknown') for error in errors)
+            if single:
+                # Match events.list, which fails outright for an inaccessible calendar
+                raise ValueError(f"Calendar {cal_id} could not be checked ({reasons})")
+            result.append(f"  • {cal_id}: could not be checked ({reasons})")
+            continue
+        for period in calendar.get('busy', []):
+            busy_start = _format_busy_time(period['start'], target_timezone)
+            busy_end = _format_busy_time(period['end'], target_timezone)
+            if single:
+                result.append(f"  • Busy: {busy_start} to {busy_end}")
+            else:
+                result.append(f"  • {cal_id}: busy {busy_start} to {busy_end}")
+    
+    if not result:
+        if single:
+            return f"Available from {range_description}"
+        return f"Available from {range_description} in all {len(ids)} calendar(s)"
+    return f"Busy periods from {range_description}:\n" + "\n".join(result)
+
+
 def check_availability(
     date: str,
     start_time: str,
@@ -49,8 +145,11 @@ def check_availability(
     calendar_id: str = DEFAULT_CALENDAR_ID,
     timezone: Optional[str] = None,
     impersonate_user: Optional[str] = None,
+    calendar_ids: Optional[str] = None,
+    structured: bool = False,
+    include_titles: bool = False,
     ctx: Context = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Check calendar availability for a time range using natural language date/time.
     
@@ -67,31 +166,42 @@ def check_availability(
         timezone: Timezone (e.g., 'America/New_York', 'UTC', 'Asia/Kolkata'). 
                   If not provided, will be auto-detected from location, or defaults to Asia/Kolkata (IST).
         impersonate_user: Optional email for service account domain-wide delegation.
+        calendar_ids: Comma-separated calendar IDs to check together (optional, up to 50).
+                      If provided, all calendars are checked with a single freebusy query
+                      and calendar_id is ignored.
+        structured: Return a dict with "available", the checked range, the "busy"
+                    periods ({calendar_id, start, end}, plus id and summary when
+                    include_titles is set) and per-calendar "errors" instead of
+                    text (default: False)
+        include_titles: List the titles of the events that make calendar_id busy
+                        (default: False). Uses events.list instead of the cheaper
+                        freebusy query; ignored when calendar_ids is given.
     
     Returns:
-        String indicating availability or listing busy periods.
+        String indicating availability or listing busy periods,
+        or an availability dict if structured is True.
     """
     try:
         headers = _extract_headers_from_context(ctx)
-        credentials = get_google_calendar_credentials(headers)
+        credentials = get_request_credentials(ctx, headers)
         service = get_calendar_service(credentials, impersonate_user)
         
         # Determine timezone: use provided timezone, or detect from location, or default to IST
         if timezone:
             target_timezone = timezone
-            logger.debug(f"Using provided timezone: {target_timezone}")
+            logger.debug("Using provided timezone: %s", target_timezone)
         elif location:
             # Try to detect timezone from location
             detected_timezone = get_timezone_from_location(location)
             if detected_timezone:
                 target_timezone = detected_timezone
-                logger.info(f"Auto-detected timezone from location '{location}': {target_timezone}")
+                logger.info("Auto-detected timezone from location '%s': %s", location, target_timezone)
             else:
                 target_timezone = 'Asia/Kolkata'
-                logger.warning(f"Could not detect timezone from location '{location}', using default: {target_timezone}")
+                logger.warning("Could not detect timezone from location '%s', using default: %s", location, target_timezone)
         else:
             target_timezone = 'Asia/Kolkata'
-            logger.debug(f"Using default timezone: {target_timezone} (IST)")
+            logger.debug("Using default timezone: %s (IST)", target_timezone)
         
         # Parse natural language date and start_time
         start_datetime_str, start_dt = parse_natural_datetime(date, start_time, target_timezone)
@@ -116,86 +226,68 @@ def check_availability(
         time_min = start_dt.isoformat()
         time_max = end_dt.isoformat()
         
-        logger.info(f"AVAILABILITY CHECK: Checking from {start_datetime_str} to {end_datetime_str} ({target_timezone})")
+        logger.info("AVAILABILITY CHECK: Checking from %s to %s (%s)", start_datetime_str, end_datetime_str, target_timezone)
         
-        # Get events in the time range
+        # Format the search time range in readable format (same as get_events)
+        start_formatted = start_dt.strftime('%d %b %Y, %I:%M %p')
+        end_formatted = end_dt.strftime('%d %b %Y, %I:%M %p')
+        
+        # freebusy answers availability on its own; events.list is only needed for titles
+        if calendar_ids or not include_titles:
+            ids = split_csv(calendar_ids) if calendar_ids else [calendar_id]
+            return _check_calendars_busy(
+                service,
+                ids,
+                time_min,
+                time_max,
+                f"{start_formatted} to {end_formatted} ({target_timezone})",
+                target_timezone,
+                structured
+            )
+        
+        # Titles requested: get the events in the time range
         events_result = service.events().list(
             calendarId=calendar_id,
             timeMin=time_min,
             timeMax=time_max,
             singleEvents=True,
-            orderBy='startTime'
+            orderBy='startTime',
+            # Partial response: only the fields used to list busy periods
+            fields='items(id,summary,start(dateTime,date),end(dateTime,date))'
         ).execute()
         
         events = events_result.get('items', [])
         
-        # Format the search time range in readable format (same as get_events)
-        start_formatted = start_dt.strftime('%d %b %Y, %I:%M %p')
-        end_formatted = end_dt.strftime('%d %b %Y, %I:%M %p')
+        if structured:
+            # Same shape as the freebusy path, with each busy period also naming its event
+            return {
+                'available': not events,
+                'time_min': time_min,
+                'time_max': time_max,
+                'timezone': target_timezone,
+                'busy': [{'calendar_id': calendar_id, **summarize_event(event)} for event in events],
+                'errors': [],
+            }
         
         if not events:
             return f"Available from {start_formatted} to {end_formatted} ({target_timezone})"
         
         result = [f"Busy periods from {start_formatted} to {end_formatted} ({target_timezone}):"]
         for event in events:
-            event_start = event['start'].get('dateTime', event['start'].get('date'))
-            event_end = event['end'].get('dateTime', event['end'].get('date'))
+            start = event['start']
+            end = event['end']
+            event_start = start.get('dateTime') or start.get('date')
+            event_end = end.get('dateTime') or end.get('date')
             summary = event.get('summary', 'No Title')
             
-            # Format times using the same format as get_events (readable format)
-            try:
-                if 'T' in event_start:
-                    # Parse datetime
-                    if event_start.endswith('Z'):
-                        start_dt_parsed = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
-                    else:
-                        start_dt_parsed = datetime.fromisoformat(event_start)
-                    
-                    # Convert to target timezone
-                    tz_obj = gettz(target_timezone)
-                    if tz_obj and start_dt_parsed.tzinfo:
-                        start_dt_local = start_dt_parsed.astimezone(tz_obj)
-                    elif tz_obj:
-                        start_dt_local = start_dt_parsed.replace(tzinfo=gettz('UTC')).astimezone(tz_obj)
-                    else:
-                        start_dt_local = start_dt_parsed
-                    
-                    # Format as readable date/time (same as get_events)
-                    event_start_formatted = start_dt_local.strftime('%d %b %Y, %I:%M %p')
-                else:
-                    # All-day event
-                    event_start_formatted = event_start
-                    
-                if 'T' in event_end:
-                    # Parse datetime
-                    if event_end.endswith('Z'):
-                        end_dt_parsed = datetime.fromisoformat(event_end.replace('Z', '+00:00'))
-                    else:
-                        end_dt_parsed = datetime.fromisoformat(event_end)
-                    
-                    # Convert to target timezone
-                    tz_obj = gettz(target_timezone)
-                    if tz_obj and end_dt_parsed.tzinfo:
-                        end_dt_local = end_dt_parsed.astimezone(tz_obj)
-                    elif tz_obj:
-                        end_dt_local = end_dt_parsed.replace(tzinfo=gettz('UTC')).astimezone(tz_obj)
-                    else:
-                        end_dt_local = end_dt_parsed
-                    
-                    # Format as readable date/time (same as get_events)
-                    event_end_formatted = end_dt_local.strftime('%d %b %Y, %I:%M %p')
-                else:
-                    # All-day event
-                    event_end_formatted = event_end
-            except Exception as e:
-                logger.debug(f"Error formatting event time: {e}")
-                event_start_formatted = event_start
-                event_end_formatted = event_end
+            # Timed events use the same readable format as get_events; all-day events keep their date
+            event_start_formatted = _format_busy_time(event_start, target_timezone) if 'T' in event_start else event_start
+            event_end_formatted = _format_busy_time(event_end, target_timezone) if 'T' in event_end else event_end
             
             result.append(f"  • {summary}: {event_start_formatted} to {event_end_formatted}")
         
         return "\n".join(result)
         
     except Exception as e:
-        logger.exception("Error checking availability")
+        log_tool_error(logger, "Error checking availability", e)
         return f"Error checking availability: {format_calendar_error(e)}"
@@ -3,43 +3,55 @@ Create event tool for Google Calendar MCP Server.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+from datetime import timedelta
+from typing import Mapping, Optional
 
 from mcp.server.fastmcp import Context
 
-from google_calendar_mcp.auth import get_calendar_service
+from google_calendar_mcp.auth import get_calendar_service, get_request_credentials
 from google_calendar_mcp.config import (
     DEFAULT_CALENDAR_ID,
     DEFAULT_REMINDERS_MINUTES,
-    get_google_calendar_credentials,
 )
 from google_calendar_mcp.utils import (
     format_calendar_error,
     get_timezone_from_location,
+    log_tool_error,
     parse_natural_datetime,
+    split_csv,
 )
 
 logger = logging.getLogger(__name__)
 
+# Reminders block for the default reminders_minutes, built once. The API client only
+# serializes the request body, so every event can share this dict.
+_DEFAULT_REMINDERS = {
+    'useDefault': False,
+    'overrides': [
+        {'method': 'email', 'minutes': DEFAULT_REMINDERS_MINUTES},
+        {'method': 'popup', 'minutes': DEFAULT_REMINDERS_MINUTES}
+    ]
+}
 
-def _extract_headers_from_context(ctx: Optional[Context]) -> dict:
-    """Extract HTTP headers from request context as lowercase dict."""
+
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
     if not ctx:
         return {}
     
-    # Check if headers are stored directly in context (for custom routes)
+    # Check if headers are stored directly in context (custom routes store them lowercased)
     if hasattr(ctx, "headers") and ctx.headers:
-        return {k.lower(): v for k, v in ctx.headers.items()}
+        return ctx.headers
     
     # Try to extract from request context (for MCP tool calls)
     try:
         request_context = ctx.request_context
         if hasattr(request_context, "request") and request_context.request:
-            request = request_context.request
-            return {name.lower(): request.headers[name] for name in request.headers.keys()}
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
     except Exception as e:
-        logger.debug(f"Could not extract headers from request context: {e}")
+        logger.debug("Could not extract headers from request context: %s", e)
     
     return {}
 
@@ -93,25 +105,25 @@ def create_event(
     """
     try:
         headers = _extract_headers_from_context(ctx)
-        credentials = get_google_calendar_credentials(headers)
+        credentials = get_request_credentials(ctx, headers)
         service = get_calendar_service(credentials, impersonate_user)
         
         # Determine timezone: use provided timezone, or detect from location, or default to IST
         if timezone:
             target_timezone = timezone
-            logger.debug(f"Using provided timezone: {target_timezone}")
+            logger.debug("Using provided timezone: %s", target_timezone)
         elif location:
             # Try to detect timezone from location
             detected_timezone = get_timezone_from_location(location)
             if detected_timezone:
                 target_timezone = detected_timezone
-                logger.info(f"Auto-detected timezone from location '{location}': {target_timezone}")
+                logger.info("Auto-detected timezone from location '%s': %s", location, target_timezone)
             else:
                 target_timezone = 'Asia/Kolkata'
-                logger.warning(f"Could not detect timezone from location '{location}', using default: {target_timezone}")
+                logger.warning("Could not detect timezone from location '%s', using default: %s", location, target_timezone)
         else:
             target_timezone = 'Asia/Kolkata'
-            logger.debug(f"Using default timezone: {target_timezone} (IST)")
+            logger.debug("Using default timezone: %s (IST)", target_timezone)
         
         # Parse date and start_time
         start_datetime_str, start_dt = parse_natural_datetime(date, start_time, target_timezone)
@@ -134,8 +146,8 @@ def create_event(
         
         # Log the event data being sent to Google Calendar
         logger.info(
-            f"EVENT CREATION: start={start_datetime_str}, end={end_datetime_str}, "
-            f"timeZone={target_timezone}, date={date}, start_time={start_time}, end_time={end_time or 'default 1h'}"
+            "EVENT CREATION: start=%s, end=%s, timeZone=%s, date=%s, start_time=%s, end_time=%s",
+            start_datetime_str, end_datetime_str, target_timezone, date, start_time, end_time or 'default 1h'
         )
         
         event = {
@@ -157,14 +169,13 @@ def create_event(
         
         # Add attendees if provided
         if attendees:
-            attendee_list = [email.strip() for email in attendees.split(',')]
-            event['attendees'] = [{'email': email} for email in attendee_list if email]
+            event['attendees'] = [{'email': email} for email in split_csv(attendees)]
         
         # Add Google Meet video conference
         if add_google_meet:
             event['conferenceData'] = {
                 'createRequest': {
-                    'requestId': f"meet-{datetime.utcnow().timestamp()}",
+                    'requestId': f"meet-{time.time_ns():x}",
                     'conferenceSolutionKey': {
                         'type': 'hangoutsMeet'
                     }
@@ -172,7 +183,9 @@ def create_event(
             }
         
         # Add reminders
-        if reminders_minutes is not None:
+        if reminders_minutes == DEFAULT_REMINDERS_MINUTES:
+            event['reminders'] = _DEFAULT_REMINDERS
+        elif reminders_minutes is not None:
             event['reminders'] = {
                 'useDefault': False,
                 'overrides': [
@@ -208,5 +221,5 @@ def create_event(
         return result
         
     except Exception as e:
-        logger.exception("Error creating event")
+        log_tool_error(logger, "Error creating event", e)
         return f"Error creating event: {format_calendar_error(e)}"
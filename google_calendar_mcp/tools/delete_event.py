@@ -4,39 +4,40 @@ Delete event tool for Google Calendar MCP Server.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Mapping, Optional
 
 from dateutil.tz import gettz
 from mcp.server.fastmcp import Context
 
-from google_calendar_mcp.auth import get_calendar_service
-from google_calendar_mcp.config import DEFAULT_CALENDAR_ID, get_google_calendar_credentials
+from google_calendar_mcp.auth import get_calendar_service, get_request_credentials
+from google_calendar_mcp.config import DEFAULT_CALENDAR_ID
 from google_calendar_mcp.utils import (
     format_calendar_error,
     get_timezone_from_location,
+    log_tool_error,
     parse_natural_datetime,
 )
 
 logger = logging.getLogger(__name__)
 
 
-def _extract_headers_from_context(ctx: Optional[Context]) -> dict:
-    """Extract HTTP headers from request context as lowercase dict."""
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
     if not ctx:
         return {}
     
-    # Check if headers are stored directly in context (for custom routes)
+    # Check if headers are stored directly in context (custom routes store them lowercased)
     if hasattr(ctx, "headers") and ctx.headers:
-        return {k.lower(): v for k, v in ctx.headers.items()}
+        return ctx.headers
     
     # Try to extract from request context (for MCP tool calls)
     try:
         request_context = ctx.request_context
         if hasattr(request_context, "request") and request_context.request:
-            request = request_context.request
-            return {name.lower(): request.headers[name] for name in request.headers.keys()}
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
     except Exception as e:
-        logger.debug(f"Could not extract headers from request context: {e}")
+        logger.debug("Could not extract headers from request context: %s", e)
     
     return {}
 
@@ -79,7 +80,7 @@ def delete_event(
     """
     try:
         headers = _extract_headers_from_context(ctx)
-        credentials = get_google_calendar_credentials(headers)
+        credentials = get_request_credentials(ctx, headers)
         service = get_calendar_service(credentials, impersonate_user)
         
         # If event_id is provided, delete directly
@@ -100,19 +101,19 @@ def delete_event(
         # Determine timezone: use provided timezone, or detect from location, or default to IST
         if timezone:
             target_timezone = timezone
-            logger.debug(f"Using provided timezone: {target_timezone}")
+            logger.debug("Using provided timezone: %s", target_timezone)
         elif location:
             # Try to detect timezone from location
             detected_timezone = get_timezone_from_location(location)
             if detected_timezone:
                 target_timezone = detected_timezone
-                logger.info(f"Auto-detected timezone from location '{location}': {target_timezone}")
+                logger.info("Auto-detected timezone from location '%s': %s", location, target_timezone)
             else:
                 target_timezone = 'Asia/Kolkata'
-                logger.warning(f"Could not detect timezone from location '{location}', using default: {target_timezone}")
+                logger.warning("Could not detect timezone from location '%s', using default: %s", location, target_timezone)
         else:
             target_timezone = 'Asia/Kolkata'
-            logger.debug(f"Using default timezone: {target_timezone} (IST)")
+            logger.debug("Using default timezone: %s (IST)", target_timezone)
         
         # Parse natural language date and time
         search_datetime_str, search_start_dt = parse_natural_datetime(date, start_time, target_timezone)
@@ -126,19 +127,21 @@ def delete_event(
         time_min = day_start.isoformat()
         time_max = day_end.isoformat()
         
-        logger.info(f"DELETE SEARCH: Looking for events between {time_min} and {time_max}, searching for {date} {start_time} (parsed as {search_start_dt})")
+        logger.info("DELETE SEARCH: Looking for events between %s and %s, searching for %s %s (parsed as %s)", time_min, time_max, date, start_time, search_start_dt)
         
         events_result = service.events().list(
             calendarId=calendar_id,
             timeMin=time_min,
             timeMax=time_max,
             singleEvents=True,
-            orderBy='startTime'
+            orderBy='startTime',
+            # Partial response: only the fields used to match and delete the event
+            fields='items(id,summary,start(dateTime,date,timeZone))'
         ).execute()
         
         events = events_result.get('items', [])
         
-        logger.info(f"DELETE SEARCH: Found {len(events)} total events on {date}")
+        logger.info("DELETE SEARCH: Found %s total events on %s", len(events), date)
         
         if not events:
             return f"No events found on {date}. Please check the date and try again."
@@ -148,12 +151,13 @@ def delete_event(
         
         # Convert search time to UTC for comparison (Google Calendar API returns times in UTC)
         search_start_utc = search_start_dt.astimezone(gettz('UTC'))
-        logger.info(f"DELETE SEARCH: Looking for events at {search_start_dt} ({target_timezone}) = {search_start_utc} (UTC)")
+        logger.info("DELETE SEARCH: Looking for events at %s (%s) = %s (UTC)", search_start_dt, target_timezone, search_start_utc)
         
         for event in events:
-            event_start = event['start'].get('dateTime', event['start'].get('date'))
+            start = event['start']
+            event_start = start.get('dateTime') or start.get('date')
             event_summary = event.get('summary', 'No Title')
-            event_timezone = event['start'].get('timeZone')
+            event_timezone = start.get('timeZone')
             
             # If timezone not in event['start'], try to detect from datetime string
             if not event_timezone and 'T' in event_start:
@@ -169,7 +173,7 @@ def delete_event(
                         event_timezone = 'UTC'
                     # For other offsets, we'll still try to match using UTC comparison
             
-            logger.info(f"DELETE CHECK: Event '{event_summary}' at {event_start} (timezone: {event_timezone or 'detected from string'})")
+            logger.info("DELETE CHECK: Event '%s' at %s (timezone: %s)", event_summary, event_start, event_timezone or 'detected from string')
             
             # Handle both dateTime and date formats
             if 'T' in event_start:
@@ -177,7 +181,7 @@ def delete_event(
                 try:
                     # Parse with timezone info - keep the original timezone for comparison
                     if event_start.endswith('Z'):
-                        event_start_dt_utc = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
+                        event_start_dt_utc = datetime.fromisoformat(event_start)
                         event_start_dt_original = event_start_dt_utc
                     elif '+' in event_start or (event_start.count('-') > 2 and 'T' in event_start):
                         # Has timezone offset - parse and keep original timezone
@@ -194,11 +198,11 @@ def delete_event(
                         event_start_dt_original = datetime.fromisoformat(event_start).replace(tzinfo=gettz('UTC'))
                         event_start_dt_utc = event_start_dt_original
                 except ValueError as e:
-                    logger.warning(f"Error parsing event time {event_start}: {e}")
+                    logger.warning("Error parsing event time %s: %s", event_start, e)
                     continue
             else:
                 # All-day event, skip for now
-                logger.debug(f"Skipping all-day event: {event_summary}")
+                logger.debug("Skipping all-day event: %s", event_summary)
                 continue
             
             # PRIMARY MATCHING: Direct hour:minute comparison from datetime string
@@ -228,14 +232,14 @@ def delete_event(
                         search_date_str = search_start_dt.strftime('%Y-%m-%d')
                         same_day_direct = (event_date_str == search_date_str)
                         
-                        logger.info(f"DELETE DIRECT CHECK: Event '{event_summary}' hour:min={event_hour_min}, Search hour:min={search_hour_min}, diff={hm_diff} min, same_day={same_day_direct}")
+                        logger.info("DELETE DIRECT CHECK: Event '%s' hour:min=%s, Search hour:min=%s, diff=%s min, same_day=%s", event_summary, event_hour_min, search_hour_min, hm_diff, same_day_direct)
                         
                         # Match if same day and within 30 minutes
                         if hm_diff <= 30 and same_day_direct:
                             time_matched = True
-                            logger.info(f"DELETE TIME MATCHED (direct): Event '{event_summary}' matches time criteria")
+                            logger.info("DELETE TIME MATCHED (direct): Event '%s' matches time criteria", event_summary)
                 except Exception as e:
-                    logger.debug(f"Direct hour:minute comparison failed: {e}")
+                    logger.debug("Direct hour:minute comparison failed: %s", e)
             
             # CRITICAL: Compare in the event's timezone context
             # If event has a timezone, interpret the UTC time in that timezone and compare with search time
@@ -261,21 +265,21 @@ def delete_event(
                     # Also check if same day
                     same_day = (event_start_dt_local.date() == search_start_dt_local.date())
                     
-                    logger.info(f"DELETE TIME CHECK: Event local={event_start_dt_local} ({event_timezone}) vs Search local={search_start_dt_local} ({target_timezone}), wall-clock diff={time_diff_minutes} min, same_day={same_day}")
+                    logger.info("DELETE TIME CHECK: Event local=%s (%s) vs Search local=%s (%s), wall-clock diff=%s min, same_day=%s", event_start_dt_local, event_timezone, search_start_dt_local, target_timezone, time_diff_minutes, same_day)
                     
                     # Match if same day and within 30 minutes
                     if same_day and time_diff_minutes <= 30:
                         time_matched = True
-                        logger.info(f"DELETE TIME MATCHED (timezone): Event '{event_summary}' matches time criteria")
+                        logger.info("DELETE TIME MATCHED (timezone): Event '%s' matches time criteria", event_summary)
                     else:
                         continue
                 else:
                     # Invalid timezone, fall back to UTC comparison
                     time_diff = abs((event_start_dt_utc - search_start_utc).total_seconds())
-                    logger.info(f"DELETE TIME CHECK: Invalid timezone '{event_timezone}', using UTC comparison: diff={time_diff} seconds")
+                    logger.info("DELETE TIME CHECK: Invalid timezone '%s', using UTC comparison: diff=%s seconds", event_timezone, time_diff)
                     if time_diff <= 1800:
                         time_matched = True
-                        logger.info(f"DELETE TIME MATCHED (UTC fallback): Event '{event_summary}' matches time criteria")
+                        logger.info("DELETE TIME MATCHED (UTC fallback): Event '%s' matches time criteria", event_summary)
                     else:
                         continue
             elif not time_matched:
@@ -289,16 +293,16 @@ def delete_event(
                 
                 if event_in_target_tz:
                     time_diff_local = abs((event_in_target_tz - search_start_dt).total_seconds())
-                    logger.info(f"DELETE TIME CHECK: Event UTC={event_start_dt_utc}, trying as {target_timezone}={event_in_target_tz} vs Search={search_start_dt}, UTC diff={time_diff_utc/60:.1f} min, Local diff={time_diff_local/60:.1f} min")
+                    logger.info("DELETE TIME CHECK: Event UTC=%s, trying as %s=%s vs Search=%s, UTC diff=%.1f min, Local diff=%.1f min", event_start_dt_utc, target_timezone, event_in_target_tz, search_start_dt, time_diff_utc / 60, time_diff_local / 60)
                     # Use the smaller difference (more flexible matching)
                     time_diff = min(time_diff_utc, time_diff_local)
                 else:
                     time_diff = time_diff_utc
-                    logger.info(f"DELETE TIME CHECK: Event UTC={event_start_dt_utc} vs Search UTC={search_start_utc}, diff={time_diff} seconds")
+                    logger.info("DELETE TIME CHECK: Event UTC=%s vs Search UTC=%s, diff=%s seconds", event_start_dt_utc, search_start_utc, time_diff)
                 
                 if time_diff <= 1800:  # Within 30 minutes
                     time_matched = True
-                    logger.info(f"DELETE TIME MATCHED (UTC): Event '{event_summary}' matches time criteria")
+                    logger.info("DELETE TIME MATCHED (UTC): Event '%s' matches time criteria", event_summary)
                 else:
                     continue
             
@@ -309,12 +313,12 @@ def delete_event(
             # If summary provided, check if it matches
             if summary:
                 if summary.lower() not in event_summary.lower():
-                    logger.info(f"DELETE SUMMARY CHECK: '{summary}' not in '{event_summary}'")
+                    logger.info("DELETE SUMMARY CHECK: '%s' not in '%s'", summary, event_summary)
                     continue
             
             # Event matches all criteria - add it
             matching_events.append(event)
-            logger.info(f"DELETE MATCH: Found matching event '{event_summary}' at {event_start}")
+            logger.info("DELETE MATCH: Found matching event '%s' at %s", event_summary, event_start)
         
         if not matching_events:
             criteria = f"on {date} at {start_time}"
@@ -323,7 +327,7 @@ def delete_event(
             # List all events found for debugging
             if events:
                 event_list = "\n".join([
-                    f"- {e.get('summary', 'No Title')} at {e['start'].get('dateTime', e['start'].get('date'))}"
+                    f"- {e.get('summary', 'No Title')} at {e['start'].get('dateTime') or e['start'].get('date')}"
                     for e in events[:5]  # Show first 5 events
                 ])
                 return f"No events found {criteria}. Found {len(events)} events on {date}:\n{event_list}\n\nPlease check the time and summary."
@@ -336,7 +340,8 @@ def delete_event(
         for event_to_delete in matching_events:
             event_id_to_delete = event_to_delete.get('id')
             event_title = event_to_delete.get('summary', 'Untitled Event')
-            event_start_time = event_to_delete['start'].get('dateTime', event_to_delete['start'].get('date'))
+            start = event_to_delete['start']
+            event_start_time = start.get('dateTime') or start.get('date')
             
             try:
                 service.events().delete(
@@ -345,9 +350,9 @@ def delete_event(
                 ).execute()
                 deleted_count += 1
                 deleted_titles.append(f"'{event_title}' ({event_start_time})")
-                logger.info(f"Deleted event: {event_title} ({event_id_to_delete})")
+                logger.info("Deleted event: %s (%s)", event_title, event_id_to_delete)
             except Exception as delete_error:
-                logger.error(f"Failed to delete event {event_id_to_delete}: {delete_error}")
+                logger.error("Failed to delete event %s: %s", event_id_to_delete, delete_error)
                 # Continue deleting other events even if one fails
         
         if deleted_count == 0:
@@ -359,5 +364,5 @@ def delete_event(
             return f"Successfully deleted {deleted_count} events:\n{events_list}"
         
     except Exception as e:
-        logger.exception("Error deleting event")
+        log_tool_error(logger, "Error deleting event", e)
         return f"Error deleting event: {format_calendar_error(e)}"
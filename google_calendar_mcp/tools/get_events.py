@@ -3,51 +3,72 @@ Get events tool for Google Calendar MCP Server.
 """
 
 import logging
-from datetime import datetime
-from typing import Optional
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from mcp.server.fastmcp import Context
 
-from google_calendar_mcp.auth import get_calendar_service
+from google_calendar_mcp.auth import get_calendar_service, get_request_credentials
 from google_calendar_mcp.config import (
     DEFAULT_CALENDAR_ID,
     DEFAULT_MAX_RESULTS,
-    get_google_calendar_credentials,
 )
-from google_calendar_mcp.utils import format_calendar_error, format_event_summary
+from google_calendar_mcp.utils import (
+    format_calendar_error,
+    format_event_summary,
+    log_tool_error,
+    summarize_event,
+)
 
 logger = logging.getLogger(__name__)
 
+# (unix second, RFC3339 string) for the most recently formatted "now"
+_now_cache = (0, "")
+
 
-def _extract_headers_from_context(ctx: Optional[Context]) -> dict:
-    """Extract HTTP headers from request context as lowercase dict."""
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
     if not ctx:
         return {}
     
-    # Check if headers are stored directly in context (for custom routes)
+    # Check if headers are stored directly in context (custom routes store them lowercased)
     if hasattr(ctx, "headers") and ctx.headers:
-        return {k.lower(): v for k, v in ctx.headers.items()}
+        return ctx.headers
     
     # Try to extract from request context (for MCP tool calls)
     try:
         request_context = ctx.request_context
         if hasattr(request_context, "request") and request_context.request:
-            request = request_context.request
-            return {name.lower(): request.headers[name] for name in request.headers.keys()}
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
     except Exception as e:
-        logger.debug(f"Could not extract headers from request context: {e}")
+        logger.debug("Could not extract headers from request context: %s", e)
     
     return {}
 
 
+def _now_rfc3339() -> str:
+    """Return the current UTC time as RFC3339 with a 'Z' suffix, formatted at most once per second."""
+    global _now_cache
+    now = int(time.time())
+    cached_second, cached_value = _now_cache
+    if now != cached_second:
+        cached_value = datetime.fromtimestamp(now, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        # Swap in a new tuple so concurrent readers never see a half-updated pair
+        _now_cache = (now, cached_value)
+    return cached_value
+
+
 def get_events(
     calendar_id: str = DEFAULT_CALENDAR_ID,
     max_results: int = DEFAULT_MAX_RESULTS,
     time_min: Optional[str] = None,
     time_max: Optional[str] = None,
     impersonate_user: Optional[str] = None,
+    structured: bool = False,
     ctx: Context = None
-) -> str:
+) -> Union[str, List[Dict[str, Any]]]:
     """
     Get calendar events.
     
@@ -60,17 +81,19 @@ def get_events(
         time_min: Start time in ISO format (default: now)
         time_max: End time in ISO format (optional, for filtering to specific day)
         impersonate_user: Optional email for service account domain-wide delegation.
+        structured: Return a list of {id, summary, start, end} dicts instead of text (default: False)
     
     Returns:
-        String listing calendar events with their titles and start times.
+        String listing calendar events with their titles and start times,
+        or a list of event dicts if structured is True.
     """
     try:
         headers = _extract_headers_from_context(ctx)
-        credentials = get_google_calendar_credentials(headers)
+        credentials = get_request_credentials(ctx, headers)
         service = get_calendar_service(credentials, impersonate_user)
         
         if not time_min:
-            time_min = datetime.utcnow().isoformat() + 'Z'
+            time_min = _now_rfc3339()
         
         # Build query parameters
         query_params = {
@@ -78,7 +101,9 @@ def get_events(
             'timeMin': time_min,
             'maxResults': max_results,
             'singleEvents': True,
-            'orderBy': 'startTime'
+            'orderBy': 'startTime',
+            # Partial response: only the fields the event summaries read
+            'fields': 'items(id,summary,start(dateTime,date),end(dateTime,date))'
         }
         
         # Add timeMax if provided (for date filtering to specific day)
@@ -89,23 +114,16 @@ def get_events(
         
         events = events_result.get('items', [])
         
+        if structured:
+            return [summarize_event(event) for event in events]
+        
         if not events:
             return "No upcoming events found."
         
-        # Determine timezone for formatting (try to get from time_min if provided)
-        format_timezone = 'Asia/Kolkata'  # default
-        if time_min:
-            try:
-                # Try to extract timezone from time_min or use default
-                # For now, use default - could be enhanced to detect from time_min
-                pass
-            except:
-                pass
-        
-        result = [format_event_summary(event, format_timezone) for event in events]
-        count = len(events)
-        return f"Found {count} event(s):\n" + "\n".join(result)
+        # Event times are shown in the default timezone
+        result = [format_event_summary(event, 'Asia/Kolkata') for event in events]
+        return f"Found {len(events)} event(s):\n" + "\n".join(result)
         
     except Exception as e:
-        logger.exception("Error getting events")
+        log_tool_error(logger, "Error getting events", e)
         return f"Error getting events: {format_calendar_error(e)}. Please check your credentials and try again."
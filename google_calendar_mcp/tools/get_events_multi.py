@@ -0,0 +1,127 @@
+"""
+Multi-calendar get events tool for Google Calendar MCP Server.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from mcp.server.fastmcp import Context
+
+from google_calendar_mcp.auth import get_request_credentials, is_service_account_credentials
+from google_calendar_mcp.config import DEFAULT_MAX_RESULTS
+from google_calendar_mcp.tools.get_events import get_events
+from google_calendar_mcp.utils import format_calendar_error, split_csv
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on events.list calls in flight at once for a single tool call,
+# to stay clear of per-user API rate limits
+MAX_CONCURRENT_REQUESTS = 10
+
+
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
+    if not ctx:
+        return {}
+    
+    # Check if headers are stored directly in context (custom routes store them lowercased)
+    if hasattr(ctx, "headers") and ctx.headers:
+        return ctx.headers
+    
+    # Try to extract from request context (for MCP tool calls)
+    try:
+        request_context = ctx.request_context
+        if hasattr(request_context, "request") and request_context.request:
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
+    except Exception as e:
+        logger.debug("Could not extract headers from request context: %s", e)
+    
+    return {}
+
+
+async def get_events_multi(
+    calendar_ids: str,
+    max_results: int = DEFAULT_MAX_RESULTS,
+    time_min: Optional[str] = None,
+    time_max: Optional[str] = None,
+    impersonate_users: Optional[str] = None,
+    structured: bool = False,
+    ctx: Context = None
+) -> Union[str, List[Dict[str, Any]]]:
+    """
+    Get events from several calendars and/or accounts concurrently.
+
+    Each calendar is fetched with its own events.list call; the calls run in
+    parallel, so the whole fan-out costs roughly one API round-trip.
+
+    Credentials are automatically retrieved from HTTP headers.
+    No need to pass credentials as a parameter.
+
+    Args:
+        calendar_ids: Comma-separated calendar IDs (e.g. 'primary,team@example.com')
+        max_results: Maximum number of events to return per calendar (default: 10)
+        time_min: Start time in ISO format (default: now)
+        time_max: End time in ISO format (optional)
+        impersonate_users: Optional comma-separated emails for service account
+                           domain-wide delegation. Every calendar is fetched for
+                           every user. Only supported with service account credentials.
+        structured: Return a list of {calendar_id, impersonate_user, events|error}
+                    dicts instead of text (default: False)
+
+    Returns:
+        String with one section of events per calendar, or a list of per-calendar
+        dicts if structured is True.
+    """
+    calendars = split_csv(calendar_ids)
+    if not calendars:
+        return "Error getting events: calendar_ids must list at least one calendar ID"
+    users = split_csv(impersonate_users)
+    if users:
+        # OAuth tokens cannot impersonate, so every "user" would get the caller's own calendar
+        try:
+            headers = _extract_headers_from_context(ctx)
+            if not is_service_account_credentials(get_request_credentials(ctx, headers)):
+                return "Error getting events: impersonate_users requires service account credentials"
+        except Exception as e:
+            return f"Error getting events: {format_calendar_error(e)}"
+    else:
+        users = [None]
+    targets = [(user, calendar_id) for user in users for calendar_id in calendars]
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def _fetch(user: Optional[str], calendar_id: str):
+        async with semaphore:
+            return await asyncio.to_thread(
+                get_events,
+                calendar_id=calendar_id,
+                max_results=max_results,
+                time_min=time_min,
+                time_max=time_max,
+                impersonate_user=user,
+                structured=structured,
+                ctx=ctx
+            )
+
+    results = await asyncio.gather(*[_fetch(user, calendar_id) for user, calendar_id in targets])
+    logger.info("Fetched events for %d calendar(s)", len(targets))
+
+    if structured:
+        rows = []
+        for (user, calendar_id), result in zip(targets, results):
+            row = {'calendar_id': calendar_id, 'impersonate_user': user}
+            # get_events reports failures as a message string rather than raising
+            if isinstance(result, str):
+                row['error'] = result
+            else:
+                row['events'] = result
+            rows.append(row)
+        return rows
+
+    sections = []
+    for (user, calendar_id), result in zip(targets, results):
+        header = f"Calendar {calendar_id}" + (f" ({user})" if user else "")
+        sections.append(f"{header}:\n{result}")
+    return "\n\n".join(sections)
@@ -3,42 +3,47 @@ List calendars tool for Google Calendar MCP Server.
 """
 
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from mcp.server.fastmcp import Context
 
-from google_calendar_mcp.auth import get_calendar_service
-from google_calendar_mcp.config import get_google_calendar_credentials
-from google_calendar_mcp.utils import format_calendar_error, format_calendar_summary
+from google_calendar_mcp.auth import get_calendar_service, get_request_credentials
+from google_calendar_mcp.utils import (
+    format_calendar_error,
+    format_calendar_summary,
+    log_tool_error,
+    summarize_calendar,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def _extract_headers_from_context(ctx: Optional[Context]) -> dict:
-    """Extract HTTP headers from request context as lowercase dict."""
+def _extract_headers_from_context(ctx: Optional[Context]) -> Mapping[str, str]:
+    """Extract HTTP headers from request context, looked up by lowercase name."""
     if not ctx:
         return {}
     
-    # Check if headers are stored directly in context (for custom routes)
+    # Check if headers are stored directly in context (custom routes store them lowercased)
     if hasattr(ctx, "headers") and ctx.headers:
-        return {k.lower(): v for k, v in ctx.headers.items()}
+        return ctx.headers
     
     # Try to extract from request context (for MCP tool calls)
     try:
         request_context = ctx.request_context
         if hasattr(request_context, "request") and request_context.request:
-            request = request_context.request
-            return {name.lower(): request.headers[name] for name in request.headers.keys()}
+            # Starlette headers are case-insensitive, so no lowercased copy is needed
+            return request_context.request.headers
     except Exception as e:
-        logger.debug(f"Could not extract headers from request context: {e}")
+        logger.debug("Could not extract headers from request context: %s", e)
     
     return {}
 
 
 def list_calendars(
     impersonate_user: Optional[str] = None,
+    structured: bool = False,
     ctx: Context = None
-) -> str:
+) -> Union[str, List[Dict[str, Any]]]:
     """
     List all available calendars.
     
@@ -47,17 +52,21 @@ def list_calendars(
     
     Args:
         impersonate_user: Optional email for service account domain-wide delegation.
+        structured: Return a list of {id, summary} dicts instead of text (default: False)
     
     Returns:
-        String listing all available calendars with their IDs.
+        String listing all available calendars with their IDs,
+        or a list of calendar dicts if structured is True.
     """
     try:
         headers = _extract_headers_from_context(ctx)
-        credentials = get_google_calendar_credentials(headers)
+        credentials = get_request_credentials(ctx, headers)
         service = get_calendar_service(credentials, impersonate_user)
-        calendars = service.calendarList().list().execute()
+        calendars = service.calendarList().list(fields='items(id,summary)').execute()
         
         items = calendars.get('items', [])
+        if structured:
+            return [summarize_calendar(cal) for cal in items]
         if not items:
             return "No calendars found."
         
@@ -65,5 +74,5 @@ def list_calendars(
         return "\n".join(result)
         
     except Exception as e:
-        logger.exception("Error listing calendars")
+        log_tool_error(logger, "Error listing calendars", e)
         return f"Error listing calendars: {format_calendar_error(e)}"
@@ -5,8 +5,9 @@ Provides error formatting, event formatting, and helper functions.
 """
 
 import logging
+import re
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from dateutil import parser as date_parser
 from dateutil.tz import gettz
@@ -20,6 +21,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# One entry per match: runs of characters between commas and whitespace
+_CSV_TOKEN = re.compile(r"[^,\s]+")
+
 # Common location to timezone mappings (fallback if geocoding fails)
 LOCATION_TIMEZONE_MAP = {
     # Major cities
@@ -107,6 +111,21 @@ def format_calendar_error(error: Exception) -> str:
     return error_msg[:500]
 
 
+def log_tool_error(tool_logger: logging.Logger, message: str, error: Exception) -> None:
+    """
+    Log a failed tool call as "<message>: <error>".
+    
+    The traceback is only attached when debug logging is on, so ordinary
+    failures (bad credentials, missing calendars) do not pay for formatting it.
+    
+    Args:
+        tool_logger: Logger of the tool module
+        message: What failed, e.g. "Error getting events"
+        error: Exception raised by the tool
+    """
+    tool_logger.error("%s: %s", message, error, exc_info=tool_logger.isEnabledFor(logging.DEBUG))
+
+
 def format_event_summary(event: Dict, timezone: str = 'Asia/Kolkata') -> str:
     """
     Format a calendar event into a readable summary string.
@@ -118,9 +137,6 @@ def format_event_summary(event: Dict, timezone: str = 'Asia/Kolkata') -> str:
     Returns:
         Formatted event summary string
     """
-    from datetime import datetime
-    from dateutil.tz import gettz
-    
     summary = event.get('summary', 'No Title')
     event_id = event.get('id', 'N/A')
     start = event.get('start', {})
@@ -129,11 +145,8 @@ def format_event_summary(event: Dict, timezone: str = 'Asia/Kolkata') -> str:
     # Format time in readable format
     try:
         if 'T' in start_time_str:
-            # Parse datetime
-            if start_time_str.endswith('Z'):
-                dt = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-            else:
-                dt = datetime.fromisoformat(start_time_str)
+            # Parse datetime (fromisoformat accepts a trailing 'Z' since Python 3.11)
+            dt = datetime.fromisoformat(start_time_str)
             
             # Convert to target timezone
             tz_obj = gettz(timezone)
@@ -172,6 +185,60 @@ def format_calendar_summary(calendar: Dict) -> str:
     return f"- {summary} (ID: {calendar_id})"
 
 
+def summarize_event(event: Dict) -> Dict[str, Any]:
+    """
+    Reduce a calendar event to the fields returned by structured tool output.
+    
+    Args:
+        event: Event dictionary from Google Calendar API
+        
+    Returns:
+        Dict with the event id, summary, and start/end as returned by the API
+    """
+    start = event.get('start', {})
+    end = event.get('end', {})
+    return {
+        'id': event.get('id'),
+        'summary': event.get('summary', 'No Title'),
+        'start': start.get('dateTime') or start.get('date'),
+        'end': end.get('dateTime') or end.get('date'),
+    }
+
+
+def summarize_calendar(calendar: Dict) -> Dict[str, Any]:
+    """
+    Reduce a calendar to the fields returned by structured tool output.
+    
+    Args:
+        calendar: Calendar dictionary from Google Calendar API
+        
+    Returns:
+        Dict with the calendar id and summary
+    """
+    return {
+        'id': calendar.get('id'),
+        'summary': calendar.get('summary', 'Unnamed Calendar'),
+    }
+
+
+def split_csv(value: Optional[str]) -> List[str]:
+    """
+    Split a comma-separated parameter (emails, calendar IDs) into its entries.
+    
+    A single regex scan drops the separators, surrounding whitespace, and empty
+    entries, instead of split() followed by strip() and a filter.
+    
+    Args:
+        value: Comma-separated string, or None
+        
+    Returns:
+        List of non-empty entries
+    """
+    if not value:
+        return []
+    return _CSV_TOKEN.findall(value)
+
+
 def parse_natural_datetime(date_str: str, time_str: Optional[str] = None, timezone: str = 'Asia/Kolkata') -> Tuple[str, datetime]:
     """
     Parse natural language date and time strings.
@@ -184,10 +251,6 @@ def parse_natural_datetime(date_str: str, time_str: Optional[str] = None, timezo
     Returns:
         Tuple of (formatted_datetime_string, datetime_object)
     """
-    from datetime import datetime
-    from dateutil import parser as date_parser
-    from dateutil.tz import gettz
-    
     try:
         # Combine date and time if both provided
         if time_str:
@@ -231,7 +294,7 @@ def parse_natural_datetime(date_str: str, time_str: Optional[str] = None, timezo
         formatted = dt.strftime('%Y-%m-%dT%H:%M:%S')
         
         # Log for debugging
-        logger.info(f"PARSING DEBUG: Input='{combined}', Timezone='{timezone}', Parsed naive={dt_naive}, Final={dt}, Formatted={formatted}")
+        logger.info("PARSING DEBUG: Input='%s', Timezone='%s', Parsed naive=%s, Final=%s, Formatted=%s", combined, timezone, dt_naive, dt, formatted)
         
         return formatted, dt
         
@@ -262,7 +325,7 @@ def get_timezone_from_location(location: str) -> Optional[str]:
     # First, check common mappings
     if location_lower in LOCATION_TIMEZONE_MAP:
         timezone = LOCATION_TIMEZONE_MAP[location_lower]
-        logger.info(f"Found timezone from mapping: {location} -> {timezone}")
+        logger.info("Found timezone from mapping: %s -> %s", location, timezone)
         return timezone
     
     # Try geocoding if available
@@ -277,16 +340,16 @@ def get_timezone_from_location(location: str) -> Optional[str]:
                 timezone = tf.timezone_at(lat=lat, lng=lon)
                 
                 if timezone:
-                    logger.info(f"Found timezone via geocoding: {location} ({lat}, {lon}) -> {timezone}")
+                    logger.info("Found timezone via geocoding: %s (%s, %s) -> %s", location, lat, lon, timezone)
                     return timezone
         except Exception as e:
-            logger.warning(f"Geocoding failed for location '{location}': {e}")
+            logger.warning("Geocoding failed for location '%s': %s", location, e)
     
     # If geocoding fails, try partial matches in the mapping
     for key, tz in LOCATION_TIMEZONE_MAP.items():
         if key in location_lower or location_lower in key:
-            logger.info(f"Found timezone from partial match: {location} -> {tz}")
+            logger.info("Found timezone from partial match: %s -> %s", location, tz)
             return tz
     
-    logger.warning(f"Could not determine timezone for location: {location}")
+    logger.warning("Could not determine timezone for location: %s", location)
     return None